@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta, tzinfo
+
+class SystemClock:
+    """Clock backed by the wall clock, used everywhere outside simulations"""
+    
+    def __init__(self, timezone: tzinfo = None):
+        # Without a timezone, dates follow the host's local time
+        self.timezone = timezone
+    
+    def now(self) -> datetime:
+        """Get the current date and time"""
+        return datetime.now(self.timezone)
+    
+    def today(self) -> str:
+        """Get the current date as YYYY-MM-DD"""
+        return self.now().strftime('%Y-%m-%d')
+
+class SimulatedClock(SystemClock):
+    """Clock that only moves when advanced, for replaying many days quickly"""
+    
+    def __init__(self, start: datetime = None):
+        self.current = start or datetime.now()
+    
+    def now(self) -> datetime:
+        """Get the simulated date and time"""
+        return self.current
+    
+    def advance(self, days: int = 1):
+        """Move the simulated clock forward by a number of days"""
+        self.current += timedelta(days=days)
@@ -16,14 +16,38 @@ class Config:
     # Scheduling Configuration
     DAILY_SEND_TIME = os.getenv('DAILY_SEND_TIME', '09:00')
     TIMEZONE = os.getenv('TIMEZONE', 'America/New_York')
+    CATCHUP_ENABLED = os.getenv('CATCHUP_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    CATCHUP_MAX_DAYS = int(os.getenv('CATCHUP_MAX_DAYS', '14'))
     
     # Database Configuration
     DATABASE_PATH = os.getenv('DATABASE_PATH', 'leetcode_agent.db')
     
+    # Stats API Configuration
+    STATS_API_HOST = os.getenv('STATS_API_HOST', '127.0.0.1')
+    STATS_API_PORT = int(os.getenv('STATS_API_PORT', '8080'))
+    STATS_API_POOL_SIZE = int(os.getenv('STATS_API_POOL_SIZE', '4'))
+    
     # LeetCode Configuration
     LEETCODE_API_URL = 'https://leetcode.com/api/problems/all/'
     LEETCODE_GRAPHQL_URL = 'https://leetcode.com/graphql'
     
+    # Message Configuration
+    MESSAGE_LOCALE = os.getenv('MESSAGE_LOCALE', 'en')
+    MESSAGE_TEMPLATES_PATH = os.getenv('MESSAGE_TEMPLATES_PATH', 'message_templates.json')
+    WHATSAPP_MAX_BODY_LENGTH = int(os.getenv('WHATSAPP_MAX_BODY_LENGTH', '1600'))
+    
+    # Rate Limit Configuration (requests per second, burst size), shared by all processes
+    RATE_LIMITS = {
+        'twilio': (
+            float(os.getenv('TWILIO_RATE_LIMIT', '1')),
+            int(os.getenv('TWILIO_RATE_BURST', '1'))
+        ),
+        'leetcode': (
+            float(os.getenv('LEETCODE_RATE_LIMIT', '0.5')),
+            int(os.getenv('LEETCODE_RATE_BURST', '2'))
+        )
+    }
+    
     @classmethod
     def validate_config(cls):
         """Validate that all required configuration is present"""
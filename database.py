@@ -1,14 +1,26 @@
 import sqlite3
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from config import Config
+from clock import SystemClock
+
+# Query used to pick the next problem of a difficulty that has never been sent
+UNSENT_PROBLEM_QUERY = '''
+    SELECT p.id, p.leetcode_id, p.title, p.difficulty, p.url
+    FROM problems p
+    LEFT JOIN sent_problems sp ON p.id = sp.problem_id
+    WHERE p.difficulty = ? AND sp.id IS NULL
+    ORDER BY RANDOM()
+    LIMIT 1
+'''
 
 class LeetCodeDatabase:
     """Database manager for tracking sent LeetCode problems"""
     
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, clock: SystemClock = None):
         self.db_path = db_path or Config.DATABASE_PATH
+        self.clock = clock or SystemClock()
         self.init_database()
     
     def init_database(self):
@@ -16,6 +28,9 @@ class LeetCodeDatabase:
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             
+            # WAL lets the stats API read while the agent is writing
+            cursor.execute('PRAGMA journal_mode=WAL')
+            
             # Create problems table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS problems (
@@ -55,6 +70,20 @@ class LeetCodeDatabase:
                 )
             ''')
             
+            # Create deliveries table to track which recipients got each batch
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS deliveries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    recipient TEXT NOT NULL,
+                    batch_date DATE NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_deliveries_recipient
+                ON deliveries (recipient, batch_date)
+            ''')
+            
             conn.commit()
     
     def add_problem(self, leetcode_id: int, title: str, difficulty: str, url: str) -> int:
@@ -78,14 +107,7 @@ class LeetCodeDatabase:
         """Get a random unsent problem of specified difficulty"""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT p.id, p.leetcode_id, p.title, p.difficulty, p.url
-                FROM problems p
-                LEFT JOIN sent_problems sp ON p.id = sp.problem_id
-                WHERE p.difficulty = ? AND sp.id IS NULL
-                ORDER BY RANDOM()
-                LIMIT 1
-            ''', (difficulty,))
+            cursor.execute(UNSENT_PROBLEM_QUERY, (difficulty,))
             
             result = cursor.fetchone()
             if result:
@@ -101,7 +123,7 @@ class LeetCodeDatabase:
     def mark_problem_sent(self, problem_id: int, difficulty: str, date: str = None):
         """Mark a problem as sent"""
         if date is None:
-            date = datetime.now().strftime('%Y-%m-%d')
+            date = self.clock.today()
         
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
@@ -122,16 +144,142 @@ class LeetCodeDatabase:
             ''', (date, easy_id, medium_id, hard_id))
             conn.commit()
     
+    def record_deliveries(self, date: str, recipients: List[str]):
+        """Record that a day's batch was delivered to each recipient"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO deliveries (recipient, batch_date)
+                VALUES (?, ?)
+            ''', [(recipient, date) for recipient in recipients])
+            conn.commit()
+    
     def was_batch_sent_today(self, date: str = None) -> bool:
         """Check if a batch was already sent today"""
         if date is None:
-            date = datetime.now().strftime('%Y-%m-%d')
+            date = self.clock.today()
         
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT id FROM daily_batches WHERE date = ?', (date,))
             return cursor.fetchone() is not None
     
+    def get_missing_batch_dates(self, until: str, max_days: int) -> List[str]:
+        """Get dates after the last recorded batch, up to and including until
+
+        Only the most recent max_days dates are returned. Nothing is missing
+        before the first batch has ever been sent.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT MAX(date) FROM daily_batches')
+            last_date = cursor.fetchone()[0]
+        
+        if not last_date:
+            return []
+        
+        last = datetime.strptime(last_date, '%Y-%m-%d')
+        end = datetime.strptime(until, '%Y-%m-%d')
+        start = max(last + timedelta(days=1), end - timedelta(days=max_days - 1))
+        
+        dates = []
+        while start <= end:
+            dates.append(start.strftime('%Y-%m-%d'))
+            start += timedelta(days=1)
+        return dates
+    
+    def claim_daily_batches(self, dates: List[str]) -> Dict[str, Dict[str, Dict]]:
+        """Pick, mark as sent and record a batch for each date in one transaction
+
+        Dates that already have a batch (e.g. claimed by another process) are
+        skipped. Claiming stops early if a difficulty runs out of problems.
+        Returns the claimed problems keyed by date, then by difficulty.
+        """
+        claimed = {}
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            
+            for date in dates:
+                cursor.execute('SELECT id FROM daily_batches WHERE date = ?', (date,))
+                if cursor.fetchone():
+                    continue
+                
+                cursor.execute('SAVEPOINT batch')
+                batch = {}
+                for difficulty in ('Easy', 'Medium', 'Hard'):
+                    cursor.execute(UNSENT_PROBLEM_QUERY, (difficulty,))
+                    result = cursor.fetchone()
+                    if not result:
+                        break
+                    
+                    batch[difficulty.lower()] = {
+                        'id': result[0],
+                        'leetcode_id': result[1],
+                        'title': result[2],
+                        'difficulty': result[3],
+                        'url': result[4]
+                    }
+                    cursor.execute('''
+                        INSERT INTO sent_problems (problem_id, sent_date, difficulty)
+                        VALUES (?, ?, ?)
+                    ''', (result[0], date, difficulty))
+                
+                if len(batch) < 3:
+                    # Give back the problems picked for the incomplete batch
+                    cursor.execute('ROLLBACK TO batch')
+                    cursor.execute('RELEASE batch')
+                    print(f"Ran out of problems while catching up on {date}")
+                    break
+                
+                cursor.execute('''
+                    INSERT INTO daily_batches
+                    (date, easy_problem_id, medium_problem_id, hard_problem_id)
+                    VALUES (?, ?, ?, ?)
+                ''', (date, batch['easy']['id'], batch['medium']['id'], batch['hard']['id']))
+                cursor.execute('RELEASE batch')
+                claimed[date] = batch
+            
+            cursor.execute('COMMIT')
+            return claimed
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+    
+    def release_daily_batches(self, dates: List[str]):
+        """Undo claim_daily_batches for dates whose messages could not be sent
+
+        Removes the batches and their sent_problems rows in one transaction,
+        so the problems and dates are picked up again on the next run.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            
+            for date in dates:
+                cursor.execute('''
+                    DELETE FROM sent_problems
+                    WHERE sent_date = ? AND problem_id IN (
+                        SELECT easy_problem_id FROM daily_batches WHERE date = ?
+                        UNION SELECT medium_problem_id FROM daily_batches WHERE date = ?
+                        UNION SELECT hard_problem_id FROM daily_batches WHERE date = ?
+                    )
+                ''', (date, date, date, date))
+                cursor.execute('DELETE FROM daily_batches WHERE date = ?', (date,))
+            
+            cursor.execute('COMMIT')
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+    
     def get_problem_count_by_difficulty(self) -> Dict[str, int]:
         """Get count of problems by difficulty"""
         with sqlite3.connect(self.db_path) as conn:
@@ -154,4 +302,12 @@ class LeetCodeDatabase:
                 GROUP BY difficulty
             ''')
             
-            return dict(cursor.fetchall()) 
\ No newline at end of file
+            return dict(cursor.fetchall())
+    
+    def explain_unsent_problem_query(self, difficulty: str = 'Easy') -> List[str]:
+        """Get the SQLite query plan used to select unsent problems"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('EXPLAIN QUERY PLAN ' + UNSENT_PROBLEM_QUERY, (difficulty,))
+            
+            return [row[-1] for row in cursor.fetchall()]
\ No newline at end of file
@@ -8,7 +8,6 @@ via WhatsApp using Twilio API.
 
 import time
 import sys
-from datetime import datetime
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
 import pytz
@@ -17,21 +16,26 @@ from config import Config
 from leetcode_fetcher import LeetCodeFetcher
 from whatsapp_sender import WhatsAppSender
 from database import LeetCodeDatabase
+from rate_limiter import RateLimiter
+from clock import SystemClock
 
 class LeetCodeAgent:
     """Main agent that coordinates LeetCode problem delivery"""
     
-    def __init__(self):
+    def __init__(self, clock: SystemClock = None):
         """Initialize the agent with all components"""
         print("🤖 Initializing LeetCode WhatsApp Agent...")
         
-        self.leetcode_fetcher = LeetCodeFetcher()
-        self.whatsapp_sender = WhatsAppSender()
-        self.db = LeetCodeDatabase()
-        
         # Set up timezone
         self.timezone = pytz.timezone(Config.TIMEZONE)
         
+        # Dates and send-time checks all come from one clock in the configured timezone
+        self.clock = clock or SystemClock(self.timezone)
+        
+        self.db = LeetCodeDatabase(clock=self.clock)
+        self.leetcode_fetcher = LeetCodeFetcher(db=self.db)
+        self.whatsapp_sender = WhatsAppSender()
+        
         # Parse the daily send time
         self.send_hour, self.send_minute = map(int, Config.DAILY_SEND_TIME.split(':'))
         
@@ -40,7 +44,7 @@ class LeetCodeAgent:
     
     def send_daily_problems(self):
         """Main function to send daily problems"""
-        print(f"\n🔄 Starting daily problem send at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"\n🔄 Starting daily problem send at {self.clock.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         # Check if WhatsApp is configured
         if not self.whatsapp_sender.is_configured():
@@ -62,6 +66,7 @@ class LeetCodeAgent:
             success = self.whatsapp_sender.send_daily_problems(formatted_message)
             
             if success:
+                self.db.record_deliveries(self.clock.today(), [self.whatsapp_sender.to_number])
                 print("✅ Daily problems sent successfully!")
                 print(f"📊 Sent problems:")
                 for difficulty, problem in problems.items():
@@ -75,6 +80,77 @@ class LeetCodeAgent:
             print(f"❌ Error in send_daily_problems: {e}")
             return False
     
+    def catch_up(self, include_today: bool = None):
+        """Send one digest covering every day missed while the agent was down
+        
+        Returns None when nothing was missed, otherwise whether every missed
+        day was sent. Today is included once its send time has passed.
+        """
+        if not self.whatsapp_sender.is_configured():
+            print("❌ WhatsApp not configured")
+            return False
+        
+        if include_today is None:
+            include_today = self._send_time_passed()
+        
+        batches = {}
+        try:
+            batches, unfilled = self.leetcode_fetcher.get_missed_problems(include_today)
+            if not batches and not unfilled:
+                return None
+            
+            if unfilled:
+                print(f"⚠️ Not enough problems to catch up on: {', '.join(unfilled)}")
+            if not batches:
+                return False
+            
+            print(f"🔁 Catching up on {len(batches)} missed day(s): {', '.join(batches)}")
+            message = self.leetcode_fetcher.format_digest_message(batches)
+            
+            if not self.whatsapp_sender.send_message(message):
+                print("❌ Failed to send catch-up digest")
+                self._release_batches(batches)
+                return False
+            
+            for date in batches:
+                self.db.record_deliveries(date, [self.whatsapp_sender.to_number])
+            if unfilled:
+                print(f"⚠️ Catch-up digest sent for {len(batches)} of {len(batches) + len(unfilled)} day(s)")
+                return False
+            
+            print("✅ Catch-up digest sent successfully!")
+            return True
+        
+        except Exception as e:
+            print(f"❌ Error in catch_up: {e}")
+            self._release_batches(batches)
+            return False
+    
+    def _release_batches(self, batches):
+        """Give back claimed batches so the next run retries them"""
+        if not batches:
+            return
+        
+        try:
+            self.db.release_daily_batches(list(batches))
+            print(f"↩️ Released {len(batches)} claimed day(s) for retry")
+        except Exception as e:
+            print(f"❌ Failed to release claimed days {', '.join(batches)}: {e}")
+    
+    def _send_time_passed(self) -> bool:
+        """Check whether today's scheduled send time has already passed"""
+        now = self.clock.now()
+        return (now.hour, now.minute) >= (self.send_hour, self.send_minute)
+    
+    def send_due_problems(self):
+        """Send today's problems, folding in any missed days as one digest"""
+        if Config.CATCHUP_ENABLED:
+            result = self.catch_up(include_today=True)
+            if result is not None:
+                return result
+        
+        return self.send_daily_problems()
+    
     def send_stats(self):
         """Send problem statistics"""
         if not self.whatsapp_sender.is_configured():
@@ -115,7 +191,7 @@ class LeetCodeAgent:
     def run_once(self):
         """Run the agent once (for testing)"""
         print("🔄 Running agent once...")
-        return self.send_daily_problems()
+        return self.send_due_problems()
     
     def start_scheduler(self):
         """Start the scheduled agent"""
@@ -127,7 +203,7 @@ class LeetCodeAgent:
         
         # Schedule daily problems
         scheduler.add_job(
-            func=self.send_daily_problems,
+            func=self.send_due_problems,
             trigger=CronTrigger(
                 hour=self.send_hour,
                 minute=self.send_minute,
@@ -138,6 +214,13 @@ class LeetCodeAgent:
             misfire_grace_time=300  # 5 minutes grace time
         )
         
+        if Config.CATCHUP_ENABLED:
+            if self._send_time_passed():
+                # Today's run was missed too; send it now, with any earlier days folded in
+                self.send_due_problems()
+            else:
+                self.catch_up(include_today=False)
+        
         try:
             print("📊 Scheduled jobs:")
             for job in scheduler.get_jobs():
@@ -158,6 +241,20 @@ class LeetCodeAgent:
             except:
                 pass
 
+def show_rate_limits():
+    """Print wait-time metrics for the shared rate limiter"""
+    metrics = RateLimiter().get_metrics()
+    
+    if not metrics:
+        print("No rate-limited requests recorded yet")
+        return
+    
+    print("⏱️ Rate limiter metrics:")
+    for endpoint, m in metrics.items():
+        print(f"   {endpoint}: {m['rate']}/s (burst {m['burst']}), "
+              f"{m['acquired']} requests, {m['waited']} waited, "
+              f"avg wait {m['avg_wait_seconds']:.2f}s, max wait {m['max_wait_seconds']:.2f}s")
+
 def main():
     """Main entry point"""
     import argparse
@@ -166,16 +263,40 @@ def main():
     parser.add_argument('--test', action='store_true', help='Test the setup')
     parser.add_argument('--once', action='store_true', help='Run once (send problems now)')
     parser.add_argument('--stats', action='store_true', help='Send problem statistics')
+    parser.add_argument('--catch-up', action='store_true', help='Send one digest for days missed while the agent was down')
     parser.add_argument('--fetch', action='store_true', help='Fetch all problems from LeetCode')
+    parser.add_argument('--rate-limits', action='store_true', help='Show shared rate limiter metrics')
+    parser.add_argument('--serve', action='store_true', help='Serve read-only stats over HTTP for dashboards')
+    parser.add_argument('--simulate', type=int, metavar='DAYS', help='Simulate DAYS daily sends against a scratch database')
+    parser.add_argument('--recipients', type=int, default=1, metavar='N', help='Number of recipients to simulate')
+    parser.add_argument('--simulate-db', metavar='PATH', help='Keep the simulation database at PATH (must not exist yet)')
+    parser.add_argument('--simulate-report', metavar='PATH', help='Write per-day simulation metrics to a CSV file')
     
     args = parser.parse_args()
     
+    if args.rate_limits:
+        show_rate_limits()
+        return
+    
+    if args.serve:
+        from stats_server import serve
+        serve()
+        return
+    
+    if args.simulate:
+        from simulation import run_simulation
+        run_simulation(args.simulate, args.recipients, args.simulate_db, args.simulate_report)
+        return
+    
     agent = LeetCodeAgent()
     
     if args.test:
         agent.test_setup()
     elif args.once:
         agent.run_once()
+    elif args.catch_up:
+        if agent.catch_up() is None:
+            print("✅ Nothing to catch up on")
     elif args.stats:
         agent.send_stats()
     elif args.fetch:
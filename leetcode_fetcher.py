@@ -1,17 +1,36 @@
 import requests
 import json
-import time
 import random
-from typing import List, Dict, Optional
+from datetime import timedelta
+from typing import List, Dict, Optional, Tuple
 from database import LeetCodeDatabase
+from message_templates import MessageTemplates
+from rate_limiter import RateLimiter
 from config import Config
+from clock import SystemClock
+
+class RateLimitedSession(requests.Session):
+    """Session that takes a token from the shared rate limiter before each request"""
+    
+    def __init__(self, rate_limiter: RateLimiter, endpoint: str):
+        super().__init__()
+        self.rate_limiter = rate_limiter
+        self.endpoint = endpoint
+    
+    def request(self, method, url, *args, **kwargs):
+        waited = self.rate_limiter.acquire(self.endpoint)
+        if waited > 0:
+            print(f"Rate limited: waited {waited:.2f}s for {self.endpoint}")
+        return super().request(method, url, *args, **kwargs)
 
 class LeetCodeFetcher:
     """Fetches LeetCode problems and manages problem selection"""
     
-    def __init__(self):
-        self.db = LeetCodeDatabase()
-        self.session = requests.Session()
+    def __init__(self, db: LeetCodeDatabase = None, clock: SystemClock = None):
+        self.db = db or LeetCodeDatabase(clock=clock)
+        self.clock = clock or self.db.clock
+        self.templates = MessageTemplates()
+        self.session = RateLimitedSession(RateLimiter(self.db.db_path), 'leetcode')
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
@@ -72,7 +91,7 @@ class LeetCodeFetcher:
     
     def get_daily_problems(self) -> Optional[Dict[str, Dict]]:
         """Get one easy, medium, and hard problem for today"""
-        today = time.strftime('%Y-%m-%d')
+        today = self.clock.today()
         
         # Check if we already sent problems today
         if self.db.was_batch_sent_today(today):
@@ -130,56 +149,52 @@ class LeetCodeFetcher:
             'hard': hard_problem
         }
     
-    def format_problems_message(self, problems: Dict[str, Dict]) -> str:
-        """Format the problems into a WhatsApp message"""
-        message_parts = [
-            "🚀 *Daily LeetCode Challenge!* 🚀",
-            "",
-            "Here are your 3 problems for today:",
-            ""
-        ]
+    def get_missed_problems(self, include_today: bool = False) -> Tuple[Dict[str, Dict[str, Dict]], List[str]]:
+        """Claim a batch for every day missed since the last send
         
-        difficulty_emojis = {
-            'easy': '🟢',
-            'medium': '🟡',
-            'hard': '🔴'
-        }
+        With include_today, today's batch is folded into the same digest, but
+        only when at least one earlier day was missed. Returns the claimed
+        batches keyed by date, and the dates that could not be filled
+        because the catalog ran out.
+        """
+        today = self.clock.today()
+        yesterday = (self.clock.now() - timedelta(days=1)).strftime('%Y-%m-%d')
         
-        for difficulty, problem in problems.items():
-            emoji = difficulty_emojis.get(difficulty, '⚪')
-            title = problem['title']
-            url = problem['url']
-            
-            message_parts.extend([
-                f"{emoji} *{difficulty.upper()}*: {title}",
-                f"🔗 {url}",
-                ""
-            ])
+        dates = self.db.get_missing_batch_dates(yesterday, Config.CATCHUP_MAX_DAYS)
+        if not dates:
+            # Nothing missed; today's batch goes out as a regular message
+            return {}, []
+        
+        if include_today:
+            dates.append(today)
         
-        message_parts.extend([
-            "Good luck and happy coding! 💪",
-            "",
-            "Remember:",
-            "• Read the problem carefully",
-            "• Think about edge cases",
-            "• Optimize your solution",
-            "• Test with examples"
-        ])
+        # Try to fetch more problems if we're running low, as get_daily_problems does
+        total_counts = self.db.get_problem_count_by_difficulty()
+        sent_counts = self.db.get_sent_count_by_difficulty()
+        remaining = min(total_counts.get(d, 0) - sent_counts.get(d, 0) for d in ['Easy', 'Medium', 'Hard'])
+        if remaining < len(dates):
+            print(f"Only {remaining} unsent problems left for {len(dates)} missed days")
+            self.fetch_all_problems()
         
-        return "\n".join(message_parts)
+        batches = self.db.claim_daily_batches(dates)
+        
+        # Dates another process claimed in the meantime are not missing
+        unfilled = [date for date in dates
+                    if date not in batches and not self.db.was_batch_sent_today(date)]
+        
+        return batches, unfilled
+    
+    def format_digest_message(self, batches: Dict[str, Dict[str, Dict]]) -> str:
+        """Format several missed days of problems into one WhatsApp message"""
+        return self.templates.render_digest(batches)
+    
+    def format_problems_message(self, problems: Dict[str, Dict]) -> str:
+        """Format the problems into a WhatsApp message"""
+        return self.templates.render_problems(problems)
     
     def get_problem_stats(self) -> str:
         """Get statistics about problems in database"""
         total_counts = self.db.get_problem_count_by_difficulty()
         sent_counts = self.db.get_sent_count_by_difficulty()
         
-        stats = ["📊 *Problem Statistics*", ""]
-        
-        for difficulty in ['Easy', 'Medium', 'Hard']:
-            total = total_counts.get(difficulty, 0)
-            sent = sent_counts.get(difficulty, 0)
-            remaining = total - sent
-            
-            stats.append(f"{difficulty}: {remaining}/{total} remaining")
-        
-        return "\n".join(stats) 
\ No newline at end of file
+        return self.templates.render_stats(total_counts, sent_counts) 
\ No newline at end of file
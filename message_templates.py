@@ -0,0 +1,236 @@
+import json
+import os
+import time
+from string import Template
+from typing import Dict, List, Optional
+from config import Config
+
+class MessageTemplates:
+    """Compiles message templates once and renders WhatsApp messages from them"""
+
+    # Built-in templates, keyed by locale. Any key can be overridden per locale
+    # through the JSON file at Config.MESSAGE_TEMPLATES_PATH.
+    DEFAULT_TEMPLATES = {
+        'en': {
+            'header': "🚀 *Daily LeetCode Challenge!* 🚀\n\nHere are your 3 problems for today:\n",
+            'problem': "$emoji *$difficulty_upper*: $title\n🔗 $url\n",
+            'footer': (
+                "Good luck and happy coding! 💪\n\n"
+                "Remember:\n"
+                "• Read the problem carefully\n"
+                "• Think about edge cases\n"
+                "• Optimize your solution\n"
+                "• Test with examples"
+            ),
+            'digest_header': "🚀 *LeetCode Catch-Up!* 🚀\n\nHere are your problems since your last message:\n",
+            'digest_day': "📅 *$date*",
+            'stats_header': "📊 *Problem Statistics*\n",
+            'stats_line': "$difficulty: $remaining/$total remaining",
+            'emoji_easy': '🟢',
+            'emoji_medium': '🟡',
+            'emoji_hard': '🔴',
+            'emoji_default': '⚪'
+        }
+    }
+
+    SEGMENTS = ('header', 'problem', 'footer', 'digest_header', 'digest_day', 'stats_header', 'stats_line')
+
+    # Upper bound on the number of distinct problem sets kept in the render cache
+    MAX_CACHED_BODIES = 128
+
+    def __init__(self, locale: str = None, templates_path: str = None):
+        self.locale = locale or Config.MESSAGE_LOCALE
+        self.templates_path = templates_path or Config.MESSAGE_TEMPLATES_PATH
+        self.max_length = Config.WHATSAPP_MAX_BODY_LENGTH
+        self.templates = self._resolve_templates()
+        self.compiled = {name: Template(self.templates[name]) for name in self.SEGMENTS}
+        self._body_cache = {}
+
+    def _load_overrides(self) -> Dict[str, Dict[str, str]]:
+        """Load user template overrides from the configured JSON file"""
+        if not self.templates_path or not os.path.exists(self.templates_path):
+            return {}
+
+        try:
+            with open(self.templates_path, encoding='utf-8') as f:
+                overrides = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Failed to load message templates from {self.templates_path}: {e}")
+            return {}
+
+        if not isinstance(overrides, dict):
+            print(f"Ignoring message templates in {self.templates_path}: expected an object keyed by locale")
+            return {}
+
+        return overrides
+
+    def _resolve_templates(self) -> Dict[str, str]:
+        """Merge templates for the locale, falling back from 'es_MX' to 'es' to 'en'"""
+        overrides = self._load_overrides()
+
+        chain = ['en']
+        language = self.locale.replace('-', '_').split('_')[0]
+        if language not in chain:
+            chain.append(language)
+        if self.locale not in chain:
+            chain.append(self.locale)
+
+        templates = {}
+        for locale in chain:
+            templates.update(self.DEFAULT_TEMPLATES.get(locale, {}))
+            templates.update(overrides.get(locale, {}))
+
+        return templates
+
+    @staticmethod
+    def _escape(value) -> str:
+        """Escape a value so it survives a second round of substitution"""
+        return str(value).replace('$', '$$')
+
+    def _render_problem_lines(self, problems: Dict[str, Dict]) -> List[str]:
+        """Render one entry per problem, escaped for a second substitution"""
+        return [
+            self.compiled['problem'].safe_substitute(
+                emoji=self.templates.get(f'emoji_{difficulty}', self.templates['emoji_default']),
+                difficulty=self._escape(difficulty),
+                difficulty_upper=self._escape(difficulty.upper()),
+                title=self._escape(problem['title']),
+                url=self._escape(problem['url'])
+            )
+            for difficulty, problem in problems.items()
+        ]
+
+    @staticmethod
+    def _problems_key(problems: Dict[str, Dict]) -> tuple:
+        return tuple((difficulty, problem.get('id'), problem['title'], problem['url'])
+                     for difficulty, problem in problems.items())
+
+    def _cached_body(self, key: tuple, build) -> Template:
+        """Get a compiled body from the render cache, building it on a miss"""
+        body = self._body_cache.get(key)
+        if body is None:
+            if len(self._body_cache) >= self.MAX_CACHED_BODIES:
+                self._body_cache.clear()
+            body = build()
+            self._body_cache[key] = body
+        return body
+
+    def _compile_body(self, problems: Dict[str, Dict]) -> Template:
+        """Render the segments shared by every recipient into a template"""
+        parts = [self.compiled['header'].safe_substitute()]
+        parts.extend(self._render_problem_lines(problems))
+        parts.append(self.compiled['footer'].safe_substitute())
+
+        return Template("\n".join(parts))
+
+    def _compile_digest(self, batches: Dict[str, Dict[str, Dict]]) -> Template:
+        """Render a catch-up digest covering several days into a template"""
+        parts = [self.compiled['digest_header'].safe_substitute(days=len(batches))]
+        for date, problems in batches.items():
+            parts.append(self.compiled['digest_day'].safe_substitute(date=self._escape(date)))
+            parts.extend(self._render_problem_lines(problems))
+        parts.append(self.compiled['footer'].safe_substitute())
+
+        return Template("\n".join(parts))
+
+    def render_problems(self, problems: Dict[str, Dict], recipient: Optional[Dict[str, str]] = None) -> str:
+        """Render the daily problems message, substituting per-recipient fields"""
+        body = self._cached_body(
+            ('daily', self._problems_key(problems)),
+            lambda: self._compile_body(problems)
+        )
+        return body.safe_substitute(recipient or {})
+
+    def render_digest(self, batches: Dict[str, Dict[str, Dict]], recipient: Optional[Dict[str, str]] = None) -> str:
+        """Render one catch-up message for several missed days, keyed by date"""
+        body = self._cached_body(
+            ('digest',) + tuple((date, self._problems_key(problems)) for date, problems in batches.items()),
+            lambda: self._compile_digest(batches)
+        )
+        return body.safe_substitute(recipient or {})
+
+    def render_stats(self, total_counts: Dict[str, int], sent_counts: Dict[str, int]) -> str:
+        """Render the problem statistics message"""
+        lines = [self.compiled['stats_header'].safe_substitute()]
+
+        for difficulty in ['Easy', 'Medium', 'Hard']:
+            total = total_counts.get(difficulty, 0)
+            sent = sent_counts.get(difficulty, 0)
+
+            lines.append(self.compiled['stats_line'].safe_substitute(
+                difficulty=difficulty,
+                remaining=total - sent,
+                total=total
+            ))
+
+        return "\n".join(lines)
+
+    def split_message(self, message: str, max_length: int = None) -> List[str]:
+        """Split a message into parts no longer than the WhatsApp body limit
+
+        Parts are broken at blank lines where possible, then at line breaks,
+        and only hard-wrapped when a single line exceeds the limit.
+        """
+        max_length = max_length or self.max_length
+        if len(message) <= max_length:
+            return [message]
+
+        parts = []
+        current = ''
+
+        for block in message.split('\n\n'):
+            candidate = f"{current}\n\n{block}" if current else block
+            if len(candidate) <= max_length:
+                current = candidate
+                continue
+
+            if current:
+                parts.append(current)
+                current = ''
+
+            for line in block.split('\n'):
+                candidate = f"{current}\n{line}" if current else line
+                if len(candidate) <= max_length:
+                    current = candidate
+                    continue
+
+                if current:
+                    parts.append(current)
+                while len(line) > max_length:
+                    parts.append(line[:max_length])
+                    line = line[max_length:]
+                current = line
+
+        if current:
+            parts.append(current)
+
+        return parts
+
+def benchmark(recipients: int = 10000) -> float:
+    """Measure how many per-recipient daily messages can be rendered per second"""
+    templates = MessageTemplates()
+    problems = {
+        'easy': {'id': 1, 'title': 'Two Sum', 'url': 'https://leetcode.com/problems/two-sum/'},
+        'medium': {'id': 2, 'title': 'Add Two Numbers', 'url': 'https://leetcode.com/problems/add-two-numbers/'},
+        'hard': {'id': 4, 'title': 'Median of Two Sorted Arrays',
+                 'url': 'https://leetcode.com/problems/median-of-two-sorted-arrays/'}
+    }
+
+    start = time.perf_counter()
+    for i in range(recipients):
+        message = templates.render_problems(problems, {'name': f'Recipient {i}'})
+        templates.split_message(message)
+    elapsed = time.perf_counter() - start
+
+    rate = recipients / elapsed if elapsed else float('inf')
+    print(f"Rendered {recipients} messages in {elapsed:.3f}s ({rate:,.0f} messages/sec)")
+    return rate
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark message template rendering')
+    parser.add_argument('--recipients', type=int, default=10000, help='Number of messages to render')
+
+    args = parser.parse_args()
+    benchmark(args.recipients)
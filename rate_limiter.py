@@ -0,0 +1,155 @@
+import sqlite3
+import time
+from typing import Dict, Optional, Tuple
+from config import Config
+
+class RateLimiter:
+    """Token-bucket rate limiter shared across processes through the SQLite database
+
+    Every process that talks to Twilio or LeetCode (the scheduler, the Task
+    Scheduler job, a manual --once run) draws tokens from the same bucket row,
+    so together they never exceed the configured rate for an endpoint.
+    """
+
+    def __init__(self, db_path: str = None, limits: Dict[str, Tuple[float, int]] = None):
+        self.db_path = db_path or Config.DATABASE_PATH
+        self.limits = limits or Config.RATE_LIMITS
+        self.validate_limits()
+        self.init_database()
+
+    def validate_limits(self):
+        """Reject limits that would divide by zero or never hand out a token"""
+        invalid = []
+        for endpoint, (rate, burst) in self.limits.items():
+            if rate <= 0:
+                invalid.append(f"{endpoint} rate must be greater than 0 (got {rate})")
+            if burst < 1:
+                invalid.append(f"{endpoint} burst must be at least 1 (got {burst})")
+
+        if invalid:
+            raise ValueError(f"Invalid rate limit configuration: {'; '.join(invalid)}")
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None so that BEGIN IMMEDIATE controls the transaction
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def init_database(self):
+        """Initialize the table holding the shared token buckets"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    endpoint TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    acquired_count INTEGER NOT NULL DEFAULT 0,
+                    waited_count INTEGER NOT NULL DEFAULT 0,
+                    total_wait_seconds REAL NOT NULL DEFAULT 0,
+                    max_wait_seconds REAL NOT NULL DEFAULT 0
+                )
+            ''')
+
+            conn.commit()
+
+    def _try_acquire(self, endpoint: str, waited: float) -> float:
+        """Take a token if one is available
+
+        Returns 0 when a token was taken, otherwise the number of seconds to
+        wait before one becomes available.
+        """
+        rate, burst = self.limits[endpoint]
+
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+
+            now = time.time()
+            cursor.execute('SELECT tokens, updated_at FROM rate_limits WHERE endpoint = ?', (endpoint,))
+            result = cursor.fetchone()
+
+            if result:
+                tokens, updated_at = result
+                tokens = min(burst, tokens + max(0.0, now - updated_at) * rate)
+            else:
+                tokens = burst
+                cursor.execute('''
+                    INSERT INTO rate_limits (endpoint, tokens, updated_at)
+                    VALUES (?, ?, ?)
+                ''', (endpoint, tokens, now))
+
+            if tokens >= 1:
+                cursor.execute('''
+                    UPDATE rate_limits
+                    SET tokens = ?, updated_at = ?,
+                        acquired_count = acquired_count + 1,
+                        waited_count = waited_count + ?,
+                        total_wait_seconds = total_wait_seconds + ?,
+                        max_wait_seconds = MAX(max_wait_seconds, ?)
+                    WHERE endpoint = ?
+                ''', (tokens - 1, now, 1 if waited > 0 else 0, waited, waited, endpoint))
+                wait = 0.0
+            else:
+                cursor.execute('''
+                    UPDATE rate_limits SET tokens = ?, updated_at = ? WHERE endpoint = ?
+                ''', (tokens, now, endpoint))
+                wait = (1 - tokens) / rate
+
+            cursor.execute('COMMIT')
+            return wait
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def acquire(self, endpoint: str) -> float:
+        """Block until a token for the endpoint is available
+
+        Returns the number of seconds spent waiting. Endpoints without a
+        configured limit are not throttled.
+        """
+        if endpoint not in self.limits:
+            return 0.0
+
+        start = time.monotonic()
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(endpoint, waited)
+            if wait <= 0:
+                return waited
+
+            time.sleep(wait)
+            waited = time.monotonic() - start
+
+    def get_metrics(self, endpoint: Optional[str] = None) -> Dict[str, Dict]:
+        """Get acquisition and wait-time metrics for each endpoint"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            query = '''
+                SELECT endpoint, tokens, acquired_count, waited_count,
+                       total_wait_seconds, max_wait_seconds
+                FROM rate_limits
+            '''
+            if endpoint:
+                cursor.execute(query + ' WHERE endpoint = ?', (endpoint,))
+            else:
+                cursor.execute(query + ' ORDER BY endpoint')
+
+            metrics = {}
+            for row in cursor.fetchall():
+                acquired = row[2]
+                rate, burst = self.limits.get(row[0], (None, None))
+                metrics[row[0]] = {
+                    'rate': rate,
+                    'burst': burst,
+                    'tokens': row[1],
+                    'acquired': acquired,
+                    'waited': row[3],
+                    'total_wait_seconds': row[4],
+                    'avg_wait_seconds': row[4] / acquired if acquired else 0.0,
+                    'max_wait_seconds': row[5]
+                }
+            return metrics
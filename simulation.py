@@ -0,0 +1,246 @@
+import csv
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from config import Config
+from clock import SimulatedClock
+from database import LeetCodeDatabase
+from leetcode_fetcher import LeetCodeFetcher
+from message_templates import MessageTemplates
+
+class SinkSender:
+    """Drop-in replacement for WhatsAppSender that counts messages instead of sending them"""
+
+    def __init__(self):
+        self.templates = MessageTemplates()
+        self.messages = 0
+        self.parts = 0
+        self.bytes = 0
+
+    def send_message(self, message: str, to: Optional[str] = None) -> bool:
+        """Count the message parts that would have been sent"""
+        parts = self.templates.split_message(message)
+        self.messages += 1
+        self.parts += len(parts)
+        self.bytes += sum(len(part.encode('utf-8')) for part in parts)
+        return True
+
+    def is_configured(self) -> bool:
+        return True
+
+class SimulatedFetcher(LeetCodeFetcher):
+    """Fetcher whose catalog is frozen, so exhaustion shows up instead of a network call"""
+
+    def fetch_all_problems(self) -> bool:
+        return False
+
+class Simulation:
+    """Replays daily send cycles against a scratch database as fast as possible"""
+
+    # Approximate number of free LeetCode problems per difficulty, used when
+    # there is no local catalog to copy
+    SYNTHETIC_CATALOG = {'Easy': 800, 'Medium': 1700, 'Hard': 700}
+
+    def __init__(self, days: int, recipients: int = 1, db_path: str = None,
+                 catalog_path: str = None, start: datetime = None):
+        self.days = days
+        self.recipients = [f'whatsapp:+1555{i:07d}' for i in range(recipients)]
+        self.catalog_path = catalog_path or Config.DATABASE_PATH
+
+        self.scratch_dir = None
+        if db_path is not None and os.path.exists(db_path):
+            # Never replay fake sends into an existing (possibly production) database
+            raise ValueError(f"Simulation database {db_path} already exists; choose a new path")
+        if db_path is None:
+            self.scratch_dir = tempfile.mkdtemp(prefix='leetcode_sim_')
+            db_path = os.path.join(self.scratch_dir, 'simulation.db')
+
+        self.clock = SimulatedClock(start)
+        self.db = LeetCodeDatabase(db_path, clock=self.clock)
+        self.fetcher = SimulatedFetcher(db=self.db)
+        self.sender = SinkSender()
+        self.results = []
+        self.exhausted = {}
+        self.projected = {}
+        self.plan = []
+
+    def seed_catalog(self) -> int:
+        """Copy the local problem catalog into the scratch DB, or generate one"""
+        problems = []
+        if os.path.exists(self.catalog_path):
+            try:
+                with sqlite3.connect(f'file:{self.catalog_path}?mode=ro', uri=True) as conn:
+                    cursor = conn.cursor()
+                    cursor.execute('SELECT leetcode_id, title, difficulty, url FROM problems')
+                    problems = cursor.fetchall()
+            except sqlite3.Error as e:
+                print(f"Could not read catalog from {self.catalog_path}: {e}")
+
+        if not problems:
+            leetcode_id = 1
+            for difficulty, count in self.SYNTHETIC_CATALOG.items():
+                for _ in range(count):
+                    problems.append((
+                        leetcode_id,
+                        f'Simulated Problem {leetcode_id}',
+                        difficulty,
+                        f'https://leetcode.com/problems/simulated-problem-{leetcode_id}/'
+                    ))
+                    leetcode_id += 1
+
+        with sqlite3.connect(self.db.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR IGNORE INTO problems (leetcode_id, title, difficulty, url)
+                VALUES (?, ?, ?, ?)
+            ''', problems)
+            conn.commit()
+
+        return len(problems)
+
+    def db_size(self) -> int:
+        """Get the size of the scratch database in bytes, including its WAL"""
+        size = 0
+        for suffix in ('', '-wal'):
+            path = self.db.db_path + suffix
+            if os.path.exists(path):
+                size += os.path.getsize(path)
+        return size
+
+    def run_day(self) -> Dict:
+        """Run one daily cycle: select the batch and fan it out to every recipient"""
+        today = self.clock.today()
+
+        start = time.perf_counter()
+        problems = self.fetcher.get_daily_problems()
+        selection_ms = (time.perf_counter() - start) * 1000
+
+        messages = 0
+        if problems:
+            for recipient in self.recipients:
+                message = self.fetcher.templates.render_problems(problems, {'recipient': recipient})
+                if self.sender.send_message(message, recipient):
+                    messages += 1
+            self.db.record_deliveries(today, self.recipients)
+        else:
+            for difficulty in ('Easy', 'Medium', 'Hard'):
+                if difficulty not in self.exhausted and not self.db.get_unsent_problem(difficulty):
+                    self.exhausted[difficulty] = today
+
+        plan = self.db.explain_unsent_problem_query()
+        plan_changed = bool(self.plan) and plan != self.plan
+        self.plan = plan
+
+        return {
+            'date': today,
+            'selection_ms': round(selection_ms, 3),
+            'db_bytes': self.db_size(),
+            'messages': messages,
+            'plan_changed': plan_changed,
+            'plan': ' | '.join(plan)
+        }
+
+    def run(self) -> List[Dict]:
+        """Simulate the configured number of days and collect per-day metrics"""
+        catalog_size = self.seed_catalog()
+        print(f"🧪 Simulating {self.days} days for {len(self.recipients)} recipients "
+              f"with {catalog_size} problems in {self.db.db_path}")
+
+        for day in range(self.days):
+            result = self.run_day()
+            self.results.append(result)
+
+            if self.exhausted:
+                print(f"⚠️ Catalog exhausted on {result['date']}, stopping after {day + 1} days")
+                break
+
+            self.clock.advance()
+
+        self.project_exhaustion()
+        return self.results
+
+    def project_exhaustion(self):
+        """Project when each difficulty that outlasted the run would run out
+
+        At one problem per day, the remaining unsent problems last from the
+        first day the simulation did not send until that many days later.
+        """
+        total_counts = self.db.get_problem_count_by_difficulty()
+        sent_counts = self.db.get_sent_count_by_difficulty()
+        next_day = self.clock.now()
+
+        self.projected = {}
+        for difficulty in ('Easy', 'Medium', 'Hard'):
+            if difficulty in self.exhausted:
+                continue
+            remaining = total_counts.get(difficulty, 0) - sent_counts.get(difficulty, 0)
+            date = (next_day + timedelta(days=remaining)).strftime('%Y-%m-%d')
+            self.projected[difficulty] = (date, remaining)
+
+    def write_report(self, path: str):
+        """Write per-day metrics to a CSV file"""
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(self.results[0].keys()))
+            writer.writeheader()
+            writer.writerows(self.results)
+        print(f"📄 Wrote per-day metrics to {path}")
+
+    def print_summary(self):
+        """Print a summary of the scaling metrics collected during the run"""
+        if not self.results:
+            print("No days simulated")
+            return
+
+        latencies = sorted(r['selection_ms'] for r in self.results)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        first, last = self.results[0], self.results[-1]
+        days = len(self.results)
+
+        print("\n📊 Simulation summary")
+        print(f"   Days simulated: {days} ({first['date']} to {last['date']})")
+        print(f"   Messages sent: {self.sender.messages} ({self.sender.parts} parts, {self.sender.bytes:,} bytes)")
+        print(f"   Selection latency: first {first['selection_ms']:.2f}ms, last {last['selection_ms']:.2f}ms, "
+              f"median {latencies[len(latencies) // 2]:.2f}ms, p95 {p95:.2f}ms, max {latencies[-1]:.2f}ms")
+        print(f"   DB size: {first['db_bytes']:,} -> {last['db_bytes']:,} bytes "
+              f"(~{(last['db_bytes'] - first['db_bytes']) // max(1, days - 1):,} bytes/day)")
+
+        for difficulty in ('Easy', 'Medium', 'Hard'):
+            if difficulty in self.exhausted:
+                print(f"   {difficulty} exhausted: {self.exhausted[difficulty]}")
+            elif difficulty in self.projected:
+                date, remaining = self.projected[difficulty]
+                print(f"   {difficulty}: stopped before exhaustion "
+                      f"({remaining} left, projected {date} at one per day)")
+
+        changes = [r['date'] for r in self.results if r['plan_changed']]
+        print(f"   Query plan: {first['plan']}")
+        if changes:
+            print(f"   Query plan changed on: {', '.join(changes)} (now: {last['plan']})")
+        else:
+            print("   Query plan unchanged")
+
+    def cleanup(self):
+        """Remove the scratch database if one was created"""
+        if self.scratch_dir:
+            shutil.rmtree(self.scratch_dir, ignore_errors=True)
+
+def run_simulation(days: int, recipients: int = 1, db_path: str = None, report_path: str = None):
+    """Run a simulation, print its summary and optionally write a CSV report"""
+    try:
+        simulation = Simulation(days, recipients, db_path=db_path)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return []
+
+    try:
+        simulation.run()
+        simulation.print_summary()
+        if report_path and simulation.results:
+            simulation.write_report(report_path)
+    finally:
+        simulation.cleanup()
+    return simulation.results
@@ -0,0 +1,271 @@
+import hashlib
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+from config import Config
+from database import LeetCodeDatabase
+
+class ReadOnlyConnectionPool:
+    """Pool of read-only SQLite connections that never take write locks"""
+
+    def __init__(self, db_path: str, size: int):
+        self.uri = Path(db_path).resolve().as_uri() + '?mode=ro'
+        self.connections = queue.Queue()
+        for _ in range(size):
+            self.connections.put(self._connect())
+
+        # Dedicated connection for PRAGMA data_version, whose value is only
+        # comparable across calls on the same connection
+        self.watcher = self._connect()
+        self.watcher_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection from the pool"""
+        conn = self.connections.get()
+        try:
+            yield conn
+        finally:
+            self.connections.put(conn)
+
+    def data_version(self) -> int:
+        """Get a counter that changes whenever another connection commits"""
+        with self.watcher_lock:
+            return self.watcher.execute('PRAGMA data_version').fetchone()[0]
+
+class ResponseCache:
+    """In-memory cache of rendered responses, invalidated by the DB change counter"""
+
+    MAX_ENTRIES = 256
+
+    def __init__(self):
+        self.entries = {}
+        self.version = None
+        self.lock = threading.Lock()
+
+    def get(self, key: str, version: int) -> Optional[Tuple[str, bytes]]:
+        """Get the cached (etag, body) for a key if the DB has not changed"""
+        with self.lock:
+            if version != self.version:
+                self.entries.clear()
+                self.version = version
+                return None
+            return self.entries.get(key)
+
+    def put(self, key: str, version: int, body: bytes) -> str:
+        """Cache a response body and return its ETag"""
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        with self.lock:
+            if version == self.version:
+                if len(self.entries) >= self.MAX_ENTRIES:
+                    self.entries.clear()
+                self.entries[key] = (etag, body)
+        return etag
+
+def query_stats(conn: sqlite3.Connection) -> Dict:
+    """Problem totals per difficulty and send progress"""
+    cursor = conn.cursor()
+
+    cursor.execute('SELECT difficulty, COUNT(*) FROM problems GROUP BY difficulty')
+    totals = dict(cursor.fetchall())
+    cursor.execute('SELECT difficulty, COUNT(*) FROM sent_problems GROUP BY difficulty')
+    sent = dict(cursor.fetchall())
+
+    difficulties = {}
+    for difficulty in ['Easy', 'Medium', 'Hard']:
+        total = totals.get(difficulty, 0)
+        sent_count = sent.get(difficulty, 0)
+        difficulties[difficulty] = {
+            'total': total,
+            'sent': sent_count,
+            'remaining': total - sent_count
+        }
+
+    cursor.execute('SELECT COUNT(*), MAX(date) FROM daily_batches')
+    batch_count, last_batch_date = cursor.fetchone()
+    cursor.execute('SELECT COUNT(DISTINCT recipient) FROM deliveries')
+    recipient_count = cursor.fetchone()[0]
+
+    return {
+        'difficulties': difficulties,
+        'batches': batch_count,
+        'last_batch_date': last_batch_date,
+        'recipients': recipient_count
+    }
+
+BATCH_COLUMNS = '''
+    b.date,
+    e.title, e.url, m.title, m.url, h.title, h.url
+'''
+
+BATCH_JOINS = '''
+    LEFT JOIN problems e ON b.easy_problem_id = e.id
+    LEFT JOIN problems m ON b.medium_problem_id = m.id
+    LEFT JOIN problems h ON b.hard_problem_id = h.id
+'''
+
+def _batch_from_row(row: tuple) -> Dict:
+    return {
+        'date': row[0],
+        'easy': {'title': row[1], 'url': row[2]},
+        'medium': {'title': row[3], 'url': row[4]},
+        'hard': {'title': row[5], 'url': row[6]}
+    }
+
+def query_recent_batches(conn: sqlite3.Connection, limit: int) -> List[Dict]:
+    """Most recent daily batches with their problems"""
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT {BATCH_COLUMNS}
+        FROM daily_batches b
+        {BATCH_JOINS}
+        ORDER BY b.date DESC
+        LIMIT ?
+    ''', (limit,))
+
+    return [_batch_from_row(row) for row in cursor.fetchall()]
+
+def query_recipient_history(conn: sqlite3.Connection, recipient: str, limit: int) -> List[Dict]:
+    """Batches delivered to a recipient, most recent first"""
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT {BATCH_COLUMNS}, d.created_at
+        FROM deliveries d
+        JOIN daily_batches b ON b.date = d.batch_date
+        {BATCH_JOINS}
+        WHERE d.recipient = ?
+        ORDER BY d.batch_date DESC
+        LIMIT ?
+    ''', (recipient, limit))
+
+    history = []
+    for row in cursor.fetchall():
+        batch = _batch_from_row(row)
+        batch['delivered_at'] = row[7]
+        history.append(batch)
+    return history
+
+class StatsRequestHandler(BaseHTTPRequestHandler):
+    """Serves read-only JSON views of the agent database"""
+
+    DEFAULT_LIMIT = 30
+    MAX_LIMIT = 365
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [unquote(part) for part in url.path.strip('/').split('/') if part]
+        params = parse_qs(url.query)
+
+        try:
+            limit = int(params.get('limit', [self.DEFAULT_LIMIT])[0])
+        except ValueError:
+            self._send_json(400, {'error': 'limit must be an integer'})
+            return
+        limit = max(1, min(limit, self.MAX_LIMIT))
+
+        if parts == ['stats']:
+            key, handler = 'stats', query_stats
+        elif parts == ['batches']:
+            key, handler = f'batches:{limit}', lambda conn: query_recent_batches(conn, limit)
+        elif len(parts) == 3 and parts[0] == 'recipients' and parts[2] == 'history':
+            recipient = parts[1]
+            key = f'history:{recipient}:{limit}'
+            handler = lambda conn: query_recipient_history(conn, recipient, limit)
+        else:
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        server = self.server
+        try:
+            version = server.pool.data_version()
+            cached = server.cache.get(key, version)
+
+            if cached:
+                etag, body = cached
+            else:
+                with server.pool.connection() as conn:
+                    data = handler(conn)
+                body = json.dumps(data).encode('utf-8')
+                etag = server.cache.put(key, version, body)
+        except sqlite3.Error as e:
+            self.log_error("Query for %s failed: %s", self.path, e)
+            self._send_json(503, {'error': 'database unavailable'})
+            return
+        except Exception as e:
+            self.log_error("Request for %s failed: %r", self.path, e)
+            self._send_json(500, {'error': 'internal server error'})
+            return
+
+        if self._etag_matches(self.headers.get('If-None-Match', ''), etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self._send_body(200, body, etag)
+
+    @staticmethod
+    def _etag_matches(if_none_match: str, etag: str) -> bool:
+        """Check an If-None-Match header, which may list several (weak) tags or '*'"""
+        for tag in if_none_match.split(','):
+            tag = tag.strip()
+            if tag.startswith('W/'):
+                tag = tag[2:]
+            if tag == '*' or tag == etag:
+                return True
+        return False
+
+    def _send_json(self, status: int, data: Dict):
+        self._send_body(status, json.dumps(data).encode('utf-8'))
+
+    def _send_body(self, status: int, body: bytes, etag: str = None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-cache')
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_request(self, code='-', size='-'):
+        # Dashboards poll constantly, so skip access lines but keep log_error output
+        pass
+
+class StatsServer(ThreadingHTTPServer):
+    """Read-only HTTP API over the agent database for dashboards"""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = None, port: int = None, db_path: str = None, pool_size: int = None):
+        db_path = db_path or Config.DATABASE_PATH
+        # Make sure the schema exists and the database is in WAL mode, so
+        # readers never block the send path
+        LeetCodeDatabase(db_path)
+
+        self.pool = ReadOnlyConnectionPool(db_path, pool_size or Config.STATS_API_POOL_SIZE)
+        self.cache = ResponseCache()
+        super().__init__((host or Config.STATS_API_HOST, port or Config.STATS_API_PORT), StatsRequestHandler)
+
+def serve():
+    """Run the stats API until interrupted"""
+    server = StatsServer()
+    host, port = server.server_address[:2]
+    print(f"📡 Serving stats API on http://{host}:{port} (/stats, /batches, /recipients/<number>/history)")
+    print("🛑 Press Ctrl+C to stop\n")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stats API stopped by user")
+    finally:
+        server.server_close()
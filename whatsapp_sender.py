@@ -2,6 +2,8 @@ from twilio.rest import Client
 from twilio.base.exceptions import TwilioException
 from typing import Optional
 from config import Config
+from message_templates import MessageTemplates
+from rate_limiter import RateLimiter
 
 class WhatsAppSender:
     """Handles sending messages via WhatsApp using Twilio API"""
@@ -13,6 +15,8 @@ class WhatsAppSender:
             self.client = Client(Config.TWILIO_ACCOUNT_SID, Config.TWILIO_AUTH_TOKEN)
             self.from_number = Config.TWILIO_WHATSAPP_FROM
             self.to_number = Config.YOUR_WHATSAPP_NUMBER
+            self.templates = MessageTemplates()
+            self.rate_limiter = RateLimiter()
             print("WhatsApp sender initialized successfully")
         except ValueError as e:
             print(f"Configuration error: {e}")
@@ -21,20 +25,30 @@ class WhatsAppSender:
             print(f"Failed to initialize WhatsApp sender: {e}")
             self.client = None
     
-    def send_message(self, message: str) -> bool:
-        """Send a message via WhatsApp"""
+    def send_message(self, message: str, to: Optional[str] = None) -> bool:
+        """Send a message via WhatsApp, to the configured number unless another is given"""
         if not self.client:
             print("WhatsApp client not initialized")
             return False
         
+        parts = self.templates.split_message(message)
+        
         try:
-            message_obj = self.client.messages.create(
-                body=message,
-                from_=self.from_number,
-                to=self.to_number
-            )
-            
-            print(f"Message sent successfully. SID: {message_obj.sid}")
+            for index, part in enumerate(parts, start=1):
+                waited = self.rate_limiter.acquire('twilio')
+                if waited > 0:
+                    print(f"Rate limited: waited {waited:.2f}s before sending")
+                
+                message_obj = self.client.messages.create(
+                    body=part,
+                    from_=self.from_number,
+                    to=to or self.to_number
+                )
+                
+                if len(parts) > 1:
+                    print(f"Message part {index}/{len(parts)} sent successfully. SID: {message_obj.sid}")
+                else:
+                    print(f"Message sent successfully. SID: {message_obj.sid}")
             return True
             
         except TwilioException as e: